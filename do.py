@@ -1,17 +1,81 @@
 # app.py
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from dateutil import parser as dateparser
-import uuid, heapq, json
-from typing import Optional, List, Any, Dict
+import uuid, heapq, json, functools, re, threading, gzip, time
+from operator import itemgetter
+from typing import Optional, List, Any, Dict, Union
+
+try:
+    import orjson  # optional: C-speed JSON for API responses, request bodies and exports
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    # Same behaviour as Flask's default provider (sorted keys, indent in debug),
+    # but encoding/decoding is done by orjson.
+    @staticmethod
+    def _option(sort_keys: bool, indent: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._option(kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent"))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # jsonify(): hand orjson's bytes straight to the response; the default
+        # implementation decodes to str, appends "\n" and re-encodes
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._option(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 app = Flask(__name__, static_folder="")
+# hard cap on request bodies (imports are the only big ones): Werkzeug answers
+# 413 before anything is buffered past this
+app.config["MAX_CONTENT_LENGTH"] = 50 * 1024 * 1024
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+@functools.lru_cache(maxsize=4096)
+def _iso_parse(s: str) -> datetime:
+    # Cached because imports repeat the same timestamps a lot; an ISO string
+    # always means the same instant and datetimes are immutable, so sharing
+    # the result is safe.
+    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+
+def _fast_parse(s: str) -> datetime:
+    # deadlines/created_at are written with isoformat(), so try the cheap
+    # parser first and only pay for dateutil on free-form input. That fallback
+    # stays uncached: dateutil fills missing fields from today's date
+    # ("17:30", "friday 5pm"), so its answer changes from day to day.
+    try:
+        return _iso_parse(s)
+    except ValueError:
+        from dateutil import parser as dateparser
+        return dateparser.parse(s)
+
+# keyword matchers for the priority heuristics (plain substring semantics,
+# compiled once so each check is a single scan of the text)
+_URGENT_RE = re.compile(r"urgent|asap|immediately")
+_HIGH_RE = re.compile(r"high|important")
+_LOW_RE = re.compile(r"low|whenever")
+# everything ai_parse_task looks for, in one pass; the group name says which hint matched
+_NLP_RE = re.compile(r"(?P<tomorrow>tomorrow)|(?P<today>today)|(?P<urgent>urgent|asap|immediately)")
 
 # -----------------------
 # Models
 # -----------------------
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class Task:
     sort_index: Any = field(init=False, repr=False)
     priority: int = 5  # lower number = higher priority
@@ -27,12 +91,33 @@ class Task:
     estimated_minutes: Optional[int] = None
     auto_assigned: bool = False
     reminded: bool = False  # server-side "reminder already sent" flag
+    version: int = field(default=0, init=False, repr=False, compare=False)  # bumped to invalidate this task's heap entries
+    internal_id: int = field(default=0, init=False, repr=False, compare=False)  # manager-assigned int, heap tie-breaker
+    _deadline_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)  # deadline as epoch seconds
+    unmet_deps: int = field(default=0, init=False, repr=False, compare=False)  # dependencies not yet completed (maintained by TaskManager)
+    _cached_dict: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)  # to_dict() result; TaskManager resets it on change
 
     def __post_init__(self):
-        deadline_ts = self.deadline.timestamp() if self.deadline else float("inf")
-        self.sort_index = (self.priority, deadline_ts)
+        self.set_deadline(self.deadline)
+        self.refresh_sort_index()
+
+    def set_deadline(self, deadline: Optional[datetime]):
+        # keep the epoch copy in sync so heap keys/scoring never call .timestamp()
+        self.deadline = deadline
+        self._deadline_ts = deadline.timestamp() if deadline else None
+
+    def refresh_sort_index(self):
+        self.version += 1
+        self.sort_index = (self.priority, self._deadline_ts if self._deadline_ts is not None else float("inf"))
 
     def to_dict(self) -> Dict:
+        # The cached dict (treat as read-only) is reused until the TaskManager
+        # changes the task. Only TaskManager._task_dict fills the cache, under
+        # the lock, so a build racing a mutation can't store stale fields.
+        cached = self._cached_dict
+        return cached if cached is not None else self._build_dict()
+
+    def _build_dict(self) -> Dict:
         return {
             "id": self.id,
             "title": self.title,
@@ -51,14 +136,14 @@ class Task:
 
     @staticmethod
     def from_dict(d: Dict) -> "Task":
-        deadline = dateparser.parse(d["deadline"]) if d.get("deadline") else None
+        deadline = _fast_parse(d["deadline"]) if d.get("deadline") else None
         t = Task(
             priority=d.get("priority", 5),
             deadline=deadline,
             id=d.get("id", str(uuid.uuid4())),
             title=d.get("title", ""),
             description=d.get("description", ""),
-            created_at=dateparser.parse(d["created_at"]) if d.get("created_at") else datetime.utcnow(),
+            created_at=_fast_parse(d["created_at"]) if d.get("created_at") else datetime.utcnow(),
             completed=d.get("completed", False),
             progress=d.get("progress", 0),
             dependencies=d.get("dependencies", []),
@@ -67,39 +152,138 @@ class Task:
             auto_assigned=d.get("auto_assigned", False),
         )
         t.reminded = d.get("reminded", False)
-        t.__post_init__()
         return t
 
 # -----------------------
 # Task Manager
 # -----------------------
+def _locked(method):
+    # The server handles requests on several threads; serialize access to the
+    # manager's dict/heap so one request never sees another's half-applied change.
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class TaskManager:
+    # How long an ai_schedule() answer is reused while nothing changes. Scores
+    # drift with the clock (tasks turn overdue, dated tasks overtake undated
+    # ones), so the cache also expires on its own.
+    SCHEDULE_TTL = 60.0
+
     def __init__(self):
+        self._lock = threading.RLock()
         self.tasks: Dict[str, Task] = {}
         self.heap: List = []
+        self._next_int_id = 0
+        # bumped by every mutation; the prefix keeps ETags from one process
+        # from matching another's (revision restarts at 0 on every start)
+        self.revision = 0
+        self._etag_prefix = uuid.uuid4().hex[:8]
+        self._export_cache = (-1, b"")  # (revision, export_json() bytes)
+        self._list_cache = (-1, b"")  # (revision, list_json() bytes)
+        self._schedule_cache = None  # ((revision, k), computed at, order)
+        self._dependents: Dict[str, List[str]] = {}  # dep id -> ids of tasks waiting on it
+        # dashboard aggregates, kept current at every mutation site
+        self.priority_counts: Dict[int, int] = {}
+        self.completed_count = 0
+        self.in_progress_count = 0
+
+    def etag(self) -> str:
+        return f"{self._etag_prefix}-{self.revision}"
+
+    # Heap entries are (sort_index, internal_id, version, task). The unique int
+    # breaks ties (in creation order) so tuples never compare Task objects, and
+    # holding the task itself means peek/pop need no dict lookup. Mutations push
+    # a fresh entry instead of rebuilding; entries whose version no longer
+    # matches the task (or whose task is completed or no longer in the store)
+    # are dropped lazily.
+    @staticmethod
+    def _heap_entry(t: Task):
+        return (t.sort_index, t.internal_id, t.version, t)
 
     def _push_heap(self, task: Task):
-        task.__post_init__()
-        heapq.heappush(self.heap, (task.sort_index, task.id))
+        # callers keep sort_index current (construction or refresh_sort_index)
+        heapq.heappush(self.heap, self._heap_entry(task))
+        self._maybe_compact()
 
     def _rebuild_heap(self):
-        self.heap = []
-        for t in self.tasks.values():
-            if not t.completed:
-                self._push_heap(t)
+        # build the entries in one go and heapify (O(N)) instead of N pushes
+        self.heap = [self._heap_entry(t) for t in self.tasks.values() if not t.completed]
+        heapq.heapify(self.heap)
+
+    def _maybe_compact(self):
+        # stale entries pile up under lazy invalidation; rebuild once they dominate
+        if len(self.heap) > 2 * len(self.tasks):
+            self._rebuild_heap()
+
+    def _is_live(self, version: int, t: Task) -> bool:
+        # the membership check covers every path that drops tasks (delete,
+        # import replacing the store), not only the ones that bump the version
+        return not t.completed and t.version == version and self.tasks.get(t.id) is t
+
+    @staticmethod
+    def _task_dict(t: Task) -> Dict:
+        # to_dict() that also fills the per-task cache; call with the lock held
+        if t._cached_dict is None:
+            t._cached_dict = t._build_dict()
+        return t._cached_dict
+
+    # Dependency bookkeeping: every task keeps a count of dependencies that are
+    # missing or not completed, and _dependents holds the reverse edges so a
+    # completion only touches the tasks that wait on it.
+    def _link_deps(self, t: Task):
+        t.unmet_deps = 0
+        for dep_id in t.dependencies:
+            self._dependents.setdefault(dep_id, []).append(t.id)
+            dep = self.tasks.get(dep_id)
+            if dep is None or not dep.completed:
+                t.unmet_deps += 1
+
+    def _unlink_deps(self, t: Task):
+        for dep_id in t.dependencies:
+            waiting = self._dependents.get(dep_id)
+            if waiting and t.id in waiting:
+                waiting.remove(t.id)
+
+    def _adjust_dependents(self, tid: str, delta: int):
+        for dependent_id in self._dependents.get(tid, ()):
+            dependent = self.tasks.get(dependent_id)
+            if dependent:
+                dependent.unmet_deps += delta
+
+    def _count(self, t: Task, sign: int):
+        # add (sign=1) or remove (sign=-1) a task's contribution to the aggregates;
+        # mutators call this with -1 before and +1 after changing a task
+        n = self.priority_counts.get(t.priority, 0) + sign
+        if n:
+            self.priority_counts[t.priority] = n
+        else:
+            self.priority_counts.pop(t.priority, None)
+        if t.completed:
+            self.completed_count += sign
+        if 0 < t.progress < 100:
+            self.in_progress_count += sign
+
+    def _set_completed(self, t: Task, completed: bool):
+        if t.completed == completed:
+            return
+        t.completed = completed
+        self._adjust_dependents(t.id, -1 if completed else 1)
 
     def auto_assign_priority_and_deadline(self, title: str, description: str, user_deadline: Optional[datetime] = None):
         # Simple heuristic: keywords + deadline proximity -> priority
         text = f"{title} {description}".lower()
         tags = []
         priority = 5
-        if any(k in text for k in ["urgent", "asap", "immediately"]):
+        if _URGENT_RE.search(text):
             priority = 1
             tags.append("urgent")
-        elif "high" in text or "important" in text:
+        elif _HIGH_RE.search(text):
             priority = min(priority, 2)
             tags.append("high")
-        elif "low" in text or "whenever" in text:
+        elif _LOW_RE.search(text):
             priority = max(priority, 7)
             tags.append("low")
 
@@ -121,30 +305,80 @@ class TaskManager:
         return priority, deadline, tags, estimated_minutes
 
     # Very small local "AI scheduler" heuristic: suggest re-prioritization & order
-    def ai_schedule(self):
-        # Rebuild heap based on combined score: priority + deadline urgency
-        now = datetime.utcnow()
+    @_locked
+    def ai_schedule(self, k: Optional[int] = None):
+        key = (self.revision, k)
+        cached = self._schedule_cache
+        computed_at = time.monotonic()
+        if cached and cached[0] == key and computed_at - cached[1] < self.SCHEDULE_TTL:
+            return list(cached[2])
+        order = self._compute_schedule(k)
+        self._schedule_cache = (key, computed_at, order)
+        return list(order)
+
+    @_locked
+    def ai_schedule_with_titles(self, k: Optional[int] = None):
+        # ai_schedule() plus {id: title} for the suggested tasks, both read under
+        # one lock so a concurrent delete can't remove a task in between
+        order = self.ai_schedule(k)
+        return order, {tid: self.tasks[tid].title for tid in order}
+
+    def _compute_schedule(self, k: Optional[int]) -> List[str]:
+        # Rebuild heap based on combined score: priority + deadline urgency.
+        # "now" is taken once and everything is plain float math on epoch
+        # seconds, so no datetime/timedelta objects are created per task.
+        # Dependencies don't affect the suggestion (complete_task enforces them),
+        # so this is a single scoring pass + sort: no graph is built, and there is
+        # no topological step for a "no dependencies" fast path to skip.
+        now_ts = datetime.utcnow().timestamp()
         score_list = []
         for t in self.tasks.values():
             if t.completed:
                 continue
-            deadline_score = 0
-            if t.deadline:
-                delta = (t.deadline - now).total_seconds()
+            score = t.priority
+            if t._deadline_ts is not None:
+                hours = (t._deadline_ts - now_ts) / 3600.0
                 # tasks overdue or very near get bonus (lower number better)
-                if delta <= 0:
-                    deadline_score = -1000
-                else:
-                    # closer deadline -> negative smaller -> better
-                    deadline_score = delta / (60 * 60)  # hours
-            score = t.priority + (deadline_score / 24.0)  # normalize
-            score_list.append((score, t))
+                # closer deadline -> smaller -> better
+                score += (-1000 if hours <= 0 else hours) / 24.0  # normalize
+            score_list.append((score, t.id))
+        if k is not None:
+            # only the first k are wanted: partial sort, O(N log k)
+            return [tid for _, tid in heapq.nsmallest(k, score_list, key=itemgetter(0))]
         # Sort by score ascending
-        score_list.sort(key=lambda x: x[0])
+        score_list.sort(key=itemgetter(0))
         # Return ordered list of ids as suggested schedule
-        return [t.id for _, t in score_list]
+        return [tid for _, tid in score_list]
 
+    @_locked
     def add_task(self, title: str, description: str = "", deadline_iso: Optional[str] = None, priority: Optional[int] = None, deps: Optional[List[str]] = None, from_nlp: bool = False, tags: Optional[List[str]] = None, minutes: Optional[int] = None) -> Task:
+        t = self._make_task(title, description, deadline_iso, priority, deps, from_nlp, tags, minutes)
+        self._register(t)
+        self._push_heap(t)
+        self.revision += 1
+        return t
+
+    @_locked
+    def add_tasks(self, payloads: List[Dict]) -> List[Task]:
+        # Bulk variant of add_task; each payload holds add_task's keyword
+        # arguments. Everything is built before anything is stored (a bad row
+        # leaves the manager untouched) and the heap is fixed up once.
+        created = [self._make_task(**p) for p in payloads]
+        for t in created:
+            self._register(t)
+        entries = [self._heap_entry(t) for t in created]
+        if len(entries) > len(self.heap):
+            # heapify is O(heap + batch); cheaper than pushes once the batch is big
+            self.heap.extend(entries)
+            heapq.heapify(self.heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self.heap, entry)
+        self._maybe_compact()
+        self.revision += 1
+        return created
+
+    def _make_task(self, title: str, description: str = "", deadline_iso: Optional[str] = None, priority: Optional[int] = None, deps: Optional[List[str]] = None, from_nlp: bool = False, tags: Optional[List[str]] = None, minutes: Optional[int] = None) -> Task:
         # NLP stub
         if from_nlp:
             parsed = self.ai_parse_task(title if not description else f"{title} {description}")
@@ -156,7 +390,7 @@ class TaskManager:
                 if parsed["priority_hint"] == "urgent":
                     priority = 1
 
-        deadline = dateparser.parse(deadline_iso) if deadline_iso else None
+        deadline = _fast_parse(deadline_iso) if deadline_iso else None
 
         if priority is None:
             priority, deadline_auto, auto_tags, estimated_minutes = self.auto_assign_priority_and_deadline(title, description, deadline)
@@ -169,14 +403,19 @@ class TaskManager:
             auto_assigned = False
 
         t = Task(priority=priority, deadline=deadline, title=title, description=description, tags=auto_tags, estimated_minutes=estimated_minutes, auto_assigned=auto_assigned)
-        self.tasks[t.id] = t
-        self._push_heap(t)
         if deps:
             for dep_id in deps:
                 if dep_id not in t.dependencies:
                     t.dependencies.append(dep_id)
         return t
 
+    def _register(self, t: Task):
+        t.internal_id = self._next_int_id
+        self._next_int_id += 1
+        self.tasks[t.id] = t
+        self._count(t, 1)
+        self._link_deps(t)
+
     # AI stub — naive
     def ai_parse_task(self, natural_text: str) -> Dict[str, Any]:
         out = {
@@ -187,98 +426,241 @@ class TaskManager:
             "dependencies": [],
             "estimated_minutes": None,
         }
-        text = natural_text.lower()
-        if "tomorrow" in text:
+        found = {m.lastgroup for m in _NLP_RE.finditer(natural_text.lower())}
+        if "tomorrow" in found:
             out["deadline"] = (datetime.utcnow() + timedelta(days=1)).isoformat()
-        elif "today" in text:
+        elif "today" in found:
             out["deadline"] = datetime.utcnow().isoformat()
-        if any(k in text for k in ["urgent", "asap", "immediately"]):
+        if "urgent" in found:
             out["priority_hint"] = "urgent"
         return out
 
     def get_task(self, tid: str) -> Optional[Task]:
         return self.tasks.get(tid)
 
+    @_locked
     def list_tasks(self, include_completed=True) -> List[Task]:
         return list(self.tasks.values()) if include_completed else [t for t in self.tasks.values() if not t.completed]
 
+    @_locked
     def update_task(self, tid: str, **kwargs) -> Task:
         t = self.get_task(tid)
         if not t:
             raise KeyError("Task not found")
+        # convert everything that can fail first, so a bad value raises before
+        # the task (or its aggregate/heap bookkeeping) is touched
+        if "deadline" in kwargs:
+            v = kwargs["deadline"]
+            kwargs["deadline"] = _fast_parse(v) if v else None
+        if "priority" in kwargs:
+            kwargs["priority"] = int(kwargs["priority"])
+        if "progress" in kwargs:
+            kwargs["progress"] = max(0, min(100, int(kwargs["progress"])))
+        self._count(t, -1)
         # update fields safely
         for k, v in kwargs.items():
             if k == "deadline":
-                t.deadline = dateparser.parse(v) if v else None
+                t.set_deadline(v)
+            elif k == "completed":
+                self._set_completed(t, bool(v))
+            elif k == "dependencies":
+                self._unlink_deps(t)
+                t.dependencies = list(v or [])
+                self._link_deps(t)
             elif hasattr(t, k):
                 setattr(t, k, v)
-        t.__post_init__()
-        self._rebuild_heap()
+        t._cached_dict = None
+        self._count(t, 1)
+        t.refresh_sort_index()
+        self._push_heap(t)
+        self.revision += 1
         return t
 
+    @_locked
     def delete_task(self, tid: str):
-        if tid in self.tasks:
-            del self.tasks[tid]
-        self._rebuild_heap()
+        t = self.tasks.pop(tid, None)
+        if t:
+            t.version += 1  # invalidate its heap entries
+            self._count(t, -1)
+            self._unlink_deps(t)
+            if t.completed:
+                # a missing dependency counts as unmet again
+                self._adjust_dependents(tid, 1)
+            self.revision += 1
+        self._maybe_compact()
 
+    @_locked
     def peek_next(self) -> Optional[Task]:
         # top of heap without removal
         while self.heap:
-            _, tid = self.heap[0]
-            t = self.tasks.get(tid)
-            if t is None or t.completed:
+            _, _, version, t = self.heap[0]
+            if not self._is_live(version, t):
                 heapq.heappop(self.heap)
                 continue
             return t
         return None
 
+    @_locked
     def pop_next(self) -> Optional[Task]:
         while self.heap:
-            _, tid = heapq.heappop(self.heap)
-            t = self.tasks.get(tid)
-            if t and not t.completed:
+            _, _, version, t = heapq.heappop(self.heap)
+            if self._is_live(version, t):
                 return t
         return None
 
+    @_locked
     def set_progress(self, tid: str, progress: int):
         t = self.get_task(tid)
         if not t:
             raise KeyError("Task not found")
-        t.progress = max(0, min(100, int(progress)))
+        progress = max(0, min(100, int(progress)))
+        self._count(t, -1)
+        t.progress = progress
         if t.progress == 100:
-            t.completed = True
-        self._rebuild_heap()
+            self._set_completed(t, True)
+        t._cached_dict = None
+        self._count(t, 1)
+        self.revision += 1
 
+    @_locked
     def complete_task(self, tid: str):
         t = self.get_task(tid)
         if not t:
             raise KeyError("Task not found")
-        # check dependencies
-        unmet = [d for d in t.dependencies if not self.tasks.get(d) or not self.tasks[d].completed]
-        if unmet:
+        # check dependencies (O(1) via the counter; only list them on failure)
+        if t.unmet_deps:
+            unmet = [d for d in t.dependencies if not self.tasks.get(d) or not self.tasks[d].completed]
             raise RuntimeError(f"Unmet dependencies: {unmet}")
-        t.completed = True
+        self._count(t, -1)
+        self._set_completed(t, True)
         t.progress = 100
-        self._rebuild_heap()
+        t._cached_dict = None
+        self._count(t, 1)
+        self.revision += 1
 
-    def export_json(self) -> str:
-        all_tasks = [t.to_dict() for t in self.tasks.values()]
-        return json.dumps({"tasks": all_tasks}, indent=2)
+    @_locked
+    def mark_reminded(self, tid: str):
+        t = self.get_task(tid)
+        if not t:
+            raise KeyError("Task not found")
+        t.reminded = True
+        t._cached_dict = None
+        self.revision += 1
+
+    @_locked
+    def mark_reminded_many(self, tids: List[str]) -> int:
+        # bulk mark_reminded: unknown ids are skipped, returns how many were marked
+        n = 0
+        for tid in tids:
+            t = self.tasks.get(tid)
+            if t:
+                t.reminded = True
+                t._cached_dict = None
+                n += 1
+        if n:
+            self.revision += 1
+        return n
+
+    @_locked
+    def summary(self) -> Dict[str, Any]:
+        # counts come from the maintained aggregates; only "overdue" depends on
+        # the clock, so it is the one figure computed per call
+        now_ts = datetime.utcnow().timestamp()
+        overdue = sum(1 for t in self.tasks.values()
+                      if not t.completed and t._deadline_ts is not None and t._deadline_ts < now_ts)
+        total = len(self.tasks)
+        return {
+            "total": total,
+            "completed": self.completed_count,
+            "in_progress": self.in_progress_count,
+            "overdue": overdue,
+            "open": max(0, total - self.completed_count - self.in_progress_count - overdue),
+            "by_priority": dict(self.priority_counts),
+        }
 
-    def import_json(self, json_str: str):
-        data = json.loads(json_str)
-        tasks = data.get("tasks", [])
-        self.tasks.clear()
-        for td in tasks:
+    @_locked
+    def list_json(self) -> bytes:
+        # The /api/tasks body: every task plus an id->title map of the open ones
+        # (the UI uses it to name suggestions). Cached per revision like
+        # export_json, so repeated polls reuse the same bytes.
+        if self._list_cache[0] != self.revision:
+            payload = {
+                "ok": True,
+                "tasks": [self._task_dict(t) for t in self.tasks.values()],
+                "map": {t.id: t.title for t in self.tasks.values() if not t.completed},
+            }
+            if orjson is not None:
+                data = orjson.dumps(payload)
+            else:
+                data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            self._list_cache = (self.revision, data)
+        return self._list_cache[1]
+
+    @_locked
+    def export_json(self) -> bytes:
+        # reserialize only when something changed since the last export; the
+        # result is UTF-8 bytes, ready to be sent as the response body
+        if self._export_cache[0] != self.revision:
+            all_tasks = [self._task_dict(t) for t in self.tasks.values()]
+            if orjson is not None:
+                data = orjson.dumps({"tasks": all_tasks}, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps({"tasks": all_tasks}, indent=2).encode("utf-8")
+            self._export_cache = (self.revision, data)
+        return self._export_cache[1]
+
+    def iter_export_chunks(self):
+        # Streaming form of export_json, byte-for-byte the same indented
+        # document: the task dicts are snapshotted under the lock, then encoded
+        # and yielded one task at a time so the whole JSON text never sits in
+        # memory at once.
+        with self._lock:
+            snapshot = [self._task_dict(t) for t in self.tasks.values()]
+        if orjson is not None:
+            encode = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        else:
+            encode = lambda obj: json.dumps(obj, indent=2).encode("utf-8")
+        if not snapshot:
+            yield b'{\n  "tasks": []\n}'
+            return
+        yield b'{\n  "tasks": ['
+        for i, d in enumerate(snapshot):
+            # nest each task two levels deep; JSON strings never hold a raw newline
+            yield (b",\n    " if i else b"\n    ") + encode(d).replace(b"\n", b"\n    ")
+        yield b"\n  ]\n}"
+
+    @_locked
+    def import_json(self, json_str: Union[str, bytes]):
+        # All or nothing: every row is parsed before the store is touched, and if
+        # installing them fails the previous tasks and aggregates are put back.
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+        new_tasks: Dict[str, Task] = {}
+        for td in data.get("tasks", []):
             t = Task.from_dict(td)
-            self.tasks[t.id] = t
-        self._rebuild_heap()
+            new_tasks[t.id] = t
+        saved = (self.tasks, self.heap, self._dependents, self.priority_counts, self.completed_count, self.in_progress_count)
+        self.tasks, self._dependents, self.priority_counts = new_tasks, {}, {}
+        self.completed_count = self.in_progress_count = 0
+        try:
+            for t in new_tasks.values():
+                t.internal_id = self._next_int_id
+                self._next_int_id += 1
+                self._link_deps(t)
+                self._count(t, 1)
+            self._rebuild_heap()
+        except Exception:
+            (self.tasks, self.heap, self._dependents, self.priority_counts,
+             self.completed_count, self.in_progress_count) = saved
+            raise
+        self.revision += 1
 
 tm = TaskManager()
 # demo tasks
-tm.add_task("Welcome: Your Priority Planner is ready", "This is a demo task (auto-generated)", priority=5)
-tm.add_task("Finish report by tomorrow", "Q3 summary", priority=2, deadline_iso=(datetime.utcnow() + timedelta(days=1)).isoformat())
-tm.add_task("Quick call with team", "Discuss milestones", priority=3, deadline_iso=(datetime.utcnow() + timedelta(hours=8)).isoformat())
+tm.add_tasks([
+    dict(title="Welcome: Your Priority Planner is ready", description="This is a demo task (auto-generated)", priority=5),
+    dict(title="Finish report by tomorrow", description="Q3 summary", priority=2, deadline_iso=(datetime.utcnow() + timedelta(days=1)).isoformat()),
+    dict(title="Quick call with team", description="Discuss milestones", priority=3, deadline_iso=(datetime.utcnow() + timedelta(hours=8)).isoformat()),
+])
 
 # -----------------------
 # Routes & API
@@ -442,16 +824,28 @@ function toLocalInputValue(isoString){
   return `${d.getFullYear()}-${pad(d.getMonth()+1)}-${pad(d.getDate())}T${pad(d.getHours())}:${pad(d.getMinutes())}`;
 }
 
+const NEWLINE_RE = /\n/g;
+const HTML_ESCAPE_RE = /[&<>"']/g;
+const HTML_ESCAPES = { '&':'&amp;', '<':'&lt;', '>':'&gt;', '"':'&quot;', "'":'&#39;' };
+function escapeHtml(s){ return String(s).replace(HTML_ESCAPE_RE, c=>HTML_ESCAPES[c]); }
+const REMINDER_PREFIX = 'Reminder: ';
+
+// toast markup is parsed once; each toast is a clone with its text filled in
+const TOAST_TEMPLATE = document.createElement('div');
+TOAST_TEMPLATE.setAttribute('role','alert');
+TOAST_TEMPLATE.setAttribute('aria-live','assertive');
+TOAST_TEMPLATE.setAttribute('aria-atomic','true');
+TOAST_TEMPLATE.innerHTML = `<div class="d-flex"><div class="toast-body"><strong></strong><div></div></div><button type="button" class="btn-close btn-close-white me-2 m-auto" data-bs-dismiss="toast" aria-label="Close"></button></div>`;
+
 function showToast(title, body, type='info', delay=8000){
   const id = 't' + Math.random().toString(36).slice(2,9);
   const container = document.getElementById('toastContainer');
-  const div = document.createElement('div');
+  const div = TOAST_TEMPLATE.cloneNode(true);
   div.className = `toast align-items-center text-bg-${type} border-0`;
   div.id = id;
-  div.setAttribute('role','alert');
-  div.setAttribute('aria-live','assertive');
-  div.setAttribute('aria-atomic','true');
-  div.innerHTML = `<div class="d-flex"><div class="toast-body"><strong>${title}</strong><div>${body}</div></div><button type="button" class="btn-close btn-close-white me-2 m-auto" data-bs-dismiss="toast" aria-label="Close"></button></div>`;
+  const toastBody = div.querySelector('.toast-body');
+  toastBody.firstChild.textContent = title; // titles are plain text (task titles included)
+  toastBody.lastChild.innerHTML = body;     // bodies may carry <br> markup
   container.appendChild(div);
   const t = new bootstrap.Toast(div, { delay });
   t.show();
@@ -461,6 +855,7 @@ function showToast(title, body, type='info', delay=8000){
 /* ---------- Data/UI ---------- */
 let statusChart = null;
 let priorityChart = null;
+let tasksById = {}; // last refreshTasks() result, so openEdit needn't refetch
 
 async function refreshCharts(tasks){
   const total = tasks.length;
@@ -500,14 +895,14 @@ async function refreshTasks(){
     const res = await fetch('/api/tasks');
     const j = await res.json();
     const tasks = j.tasks || [];
+    tasksById = Object.fromEntries(tasks.map(t=>[t.id, t]));
     const container = document.getElementById('task-list');
     container.innerHTML = '';
-    // sort by priority then deadline
+    // sort by priority then deadline (deadline parsed once per task, not per comparison)
+    for(const t of tasks) t._due = t.deadline ? new Date(t.deadline).getTime() : Infinity;
     tasks.sort((a,b)=>{
       if(a.priority !== b.priority) return a.priority - b.priority;
-      const da = a.deadline?new Date(a.deadline).getTime():Infinity;
-      const db = b.deadline?new Date(b.deadline).getTime():Infinity;
-      return da - db;
+      return a._due - b._due;
     });
 
     for(const t of tasks){
@@ -547,6 +942,8 @@ async function refreshTasks(){
     }
     renderNotificationIfNeeded(tasks);
     refreshCharts(tasks);
+    // tasks may have changed: re-evaluate reminders on this list (no second fetch)
+    scheduleReminderCheck(evaluateReminders(tasks));
   } catch (e){
     console.error('Failed to refresh tasks', e);
   }
@@ -575,9 +972,12 @@ document.getElementById('taskForm').addEventListener('submit', async function(e)
 });
 
 async function openEdit(id){
-  const res = await fetch('/api/tasks');
-  const j = await res.json();
-  const t = (j.tasks || []).find(x=>x.id===id);
+  let t = tasksById[id];
+  if(!t){
+    const res = await fetch('/api/task/' + id);
+    const j = await res.json();
+    t = j.task;
+  }
   if(!t) return alert('Task not found');
   document.getElementById('editId').value = t.id;
   document.getElementById('editTitle').value = t.title;
@@ -648,38 +1048,83 @@ function renderNotificationIfNeeded(tasks){
   // nothing here; checkReminders has logic
 }
 
-async function checkReminders(){
-  const res = await fetch('/api/tasks'); const j = await res.json(); const tasks = j.tasks || [];
-  const minutes = parseInt(document.getElementById('reminderWindow').value) || 60;
-  const now = new Date();
-  for(const t of tasks){
-    if(t.completed) continue;
-    if(t.reminded) continue; // server-side indicated already reminded
-    if(!t.deadline) continue;
-    const d = new Date(t.deadline);
-    const diffMin = (d - now) / (60*1000);
-    if(diffMin <= minutes && diffMin >= -60){ // within window or just passed (not >1hr late)
-      // show toast and mark on server as reminded
-      showToast('Reminder: ' + (t.title||'Task'), `Due at ${d.toLocaleString()}`, 'warning', 15000);
-      // mark server-side so we don't remind repeatedly
-      fetch('/api/mark_reminded', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ id: t.id })});
+// Checks are scheduled adaptively rather than on a fixed interval: the next one
+// runs when the soonest task enters the reminder window (clamped to 15s..5min),
+// there is only ever one pending timer, and nothing runs while the tab is hidden.
+// refreshTasks() evaluates the list it already fetched; only the timer fetches.
+const REMINDER_MIN_DELAY = 15 * 1000;
+const REMINDER_MAX_DELAY = 5 * 60 * 1000;
+let reminderTimer = null;
+let reminderRunning = false;
+const remindedHere = new Set(); // toasted on this page; the server flag may lag behind
+
+function scheduleReminderCheck(delay){
+  clearTimeout(reminderTimer); // replace, never stack
+  reminderTimer = document.hidden ? null : setTimeout(checkReminders, delay);
+}
+
+// show due reminders for this task list; returns the delay until the next check
+function evaluateReminders(tasks){
+  let nextMs = REMINDER_MAX_DELAY;
+  try {
+    const minutes = parseInt(document.getElementById('reminderWindow').value) || 60;
+    const now = new Date();
+    const remindedIds = [];
+    for(const t of tasks){
+      if(t.completed) continue;
+      if(t.reminded || remindedHere.has(t.id)) continue; // already reminded
+      if(!t.deadline) continue;
+      const d = new Date(t.deadline);
+      const diffMin = (d - now) / (60*1000);
+      if(diffMin <= minutes && diffMin >= -60){ // within window or just passed (not >1hr late)
+        // show toast and mark on server as reminded
+        const reminderTitle = REMINDER_PREFIX + (t.title||'Task');
+        showToast(reminderTitle, `Due at ${d.toLocaleString()}`, 'warning', 15000);
+        remindedHere.add(t.id);
+        remindedIds.push(t.id);
+      } else if(diffMin > minutes){
+        nextMs = Math.min(nextMs, (diffMin - minutes) * 60 * 1000);
+      }
+    }
+    // mark server-side so we don't remind repeatedly (one request for the whole batch)
+    if(remindedIds.length){
+      fetch('/api/mark_reminded_bulk', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ ids: remindedIds })});
     }
+  } catch (e){
+    console.error('Reminder check failed', e);
+  }
+  return Math.max(REMINDER_MIN_DELAY, Math.min(nextMs, REMINDER_MAX_DELAY));
+}
+
+// timer path: fetch the list, then evaluate it
+async function checkReminders(){
+  if(reminderRunning) return;
+  reminderRunning = true;
+  let delay = REMINDER_MAX_DELAY;
+  try {
+    const res = await fetch('/api/tasks'); const j = await res.json();
+    delay = evaluateReminders(j.tasks || []);
+  } catch (e){
+    console.error('Reminder check failed', e);
+  } finally {
+    reminderRunning = false;
+    scheduleReminderCheck(delay);
   }
 }
 
-// run periodic check
-setInterval(checkReminders, 60 * 1000); // every 60s
-// also run at load
-setTimeout(checkReminders, 1500);
+// pause while hidden, check soon after the tab comes back (the initial
+// refreshTasks() evaluates reminders at load)
+document.addEventListener('visibilitychange', ()=>scheduleReminderCheck(1500));
 
 /* ---------- AI Scheduler ---------- */
 async function autoSchedule(){
-  const res = await fetch('/api/ai_schedule');
+  const res = await fetch('/api/ai_schedule?k=10');
   const j = await res.json();
   if(j.ok){
     // j.order is array of task ids in suggested order
     let msg = 'Suggested order (top first):\n' + j.order.slice(0,10).map((id,i)=>`${i+1}. ${ (j.map[id]||'') }`).join('\n');
-    showToast('AI Schedule suggested', msg.replace(/\n/g,'<br>'), 'info', 10000);
+    // task titles are text: escape them before the newlines become <br> markup
+    showToast('AI Schedule suggested', escapeHtml(msg).replace(NEWLINE_RE,'<br>'), 'info', 10000);
   } else {
     showToast('AI Schedule error', j.error||'Error', 'danger');
   }
@@ -692,50 +1137,159 @@ refreshTasks();
 </html>
 """
 
+# INDEX_HTML has no request-dependent variables: compile and render it once at
+# import and serve the prebuilt (gzipped) bytes, instead of running it through
+# Jinja on every page load. If it ever needs per-request context, call
+# _INDEX_TEMPLATE.render(...) in the view; that still skips the parse.
+_INDEX_TEMPLATE = app.jinja_env.from_string(INDEX_HTML)
+_INDEX_BYTES = _INDEX_TEMPLATE.render().encode("utf-8")
+_INDEX_GZ = gzip.compress(_INDEX_BYTES, compresslevel=6)
+
 @app.route("/")
 def index():
-    return render_template_string(INDEX_HTML)
+    if request.accept_encodings["gzip"]:
+        resp = Response(_INDEX_GZ, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(_INDEX_BYTES, mimetype="text/html")
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "public, max-age=300"
+    return resp
+
+def _conditional(build):
+    # Conditional GET keyed on tm.revision: 304 with no body when the client's
+    # If-None-Match is current, otherwise build() the response. Either way it is
+    # tagged and marked no-cache so browsers always revalidate.
+    etag = tm.etag()
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = build()
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 # API: list tasks
 @app.route("/api/tasks", methods=["GET"])
 def api_list_tasks():
-    tasks = [t.to_dict() for t in tm.list_tasks(include_completed=True)]
-    # provide map for id->title to help UI show suggested names
-    id_map = {t.id: t.title for t in tm.list_tasks(include_completed=False)}
-    return jsonify({"tasks": tasks, "ok": True, "map": id_map})
+    # the UI polls this; most polls end in a 304, and clients without the
+    # current ETag share one serialized body per revision
+    return _conditional(lambda: app.response_class(tm.list_json(), mimetype="application/json"))
+
+# API: dashboard aggregates without shipping the task list
+@app.route("/api/summary", methods=["GET"])
+def api_summary():
+    return jsonify({"ok": True, "summary": tm.summary()})
+
+# accepted JSON types per task payload field; checked before anything reaches tm
+_NULL = type(None)
+_TASK_SCHEMA = {
+    "title": (str,),
+    "description": (str,),
+    "priority": (int, _NULL),
+    "deadline": (str, _NULL),
+    "deps": (list, _NULL),
+    "tags": (list, _NULL),
+    "minutes": (int, _NULL),
+    "from_nlp": (bool,),
+}
+
+# same for PUT /api/task/<id>; only these fields are forwarded to update_task
+_UPDATE_SCHEMA = {
+    "title": (str,),
+    "description": (str,),
+    "priority": (int,),
+    "deadline": (str, _NULL),
+    "progress": (int,),
+    "tags": (list,),
+}
+
+def _schema_error(data: Any, schema: Dict[str, tuple]) -> Optional[str]:
+    # one pass over the schema; returns an error message or None if the types fit
+    if not isinstance(data, dict):
+        return "JSON object required"
+    for key, types in schema.items():
+        if key not in data:
+            continue
+        v = data[key]
+        if not isinstance(v, types) or (isinstance(v, bool) and bool not in types):
+            return f"Invalid {key}"
+        if isinstance(v, list) and not all(isinstance(x, str) for x in v):
+            return f"Invalid {key}: expected a list of strings"
+    return None
+
+def _task_payload_error(data: Any) -> Optional[str]:
+    # returns an error message or None if the payload is usable
+    error = _schema_error(data, _TASK_SCHEMA)
+    if error:
+        return error
+    if not data.get("title", "").strip():
+        return "Title required"
+    return None
+
+def _task_kwargs(data: Dict) -> Dict[str, Any]:
+    # map an API task payload onto TaskManager.add_task keyword arguments
+    return {
+        "title": data.get("title", "").strip(),
+        "description": data.get("description", "").strip(),
+        "priority": data.get("priority", None),
+        "deadline_iso": data.get("deadline", None),
+        "deps": data.get("deps", None),
+        "tags": data.get("tags", []),
+        "minutes": data.get("minutes", None),
+        "from_nlp": data.get("from_nlp", False),
+    }
 
 # API: add task
 @app.route("/api/tasks", methods=["POST"])
 def api_create_task():
     data = request.json or {}
-    title = data.get("title", "").strip()
-    description = data.get("description", "").strip()
-    priority = data.get("priority", None)
-    deadline = data.get("deadline", None)
-    deps = data.get("deps", None)
-    tags = data.get("tags", [])
-    minutes = data.get("minutes", None)
-    from_nlp = data.get("from_nlp", False)
-    if not title:
-        return jsonify({"ok": False, "error": "Title required"}), 400
+    error = _task_payload_error(data)
+    if error:
+        return jsonify({"ok": False, "error": error}), 400
     try:
-        t = tm.add_task(title=title, description=description, deadline_iso=deadline, priority=priority, deps=deps, from_nlp=from_nlp, tags=tags, minutes=minutes)
+        t = tm.add_task(**_task_kwargs(data))
         return jsonify({"ok": True, "task": t.to_dict()})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
+# API: add many tasks in one request ({"tasks": [<same payload as POST /api/tasks>, ...]})
+@app.route("/api/tasks/bulk", methods=["POST"])
+def api_create_tasks_bulk():
+    data = request.json or {}
+    rows = data.get("tasks", []) if isinstance(data, dict) else None
+    if not isinstance(rows, list):
+        return jsonify({"ok": False, "error": "tasks must be a list"}), 400
+    for i, row in enumerate(rows):
+        error = _task_payload_error(row)
+        if error:
+            return jsonify({"ok": False, "error": f"{error} (row {i})"}), 400
+    try:
+        created = tm.add_tasks([_task_kwargs(row) for row in rows])
+        return jsonify({"ok": True, "tasks": [t.to_dict() for t in created]})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+# API: get single task
+@app.route("/api/task/<tid>", methods=["GET"])
+def api_get_task(tid):
+    t = tm.get_task(tid)
+    if not t:
+        return jsonify({"ok": False, "error": "Task not found"}), 404
+    return _conditional(lambda: jsonify({"ok": True, "task": t.to_dict()}))
+
 # API: update task
 @app.route("/api/task/<tid>", methods=["PUT"])
 def api_update_task(tid):
     data = request.json or {}
+    error = _schema_error(data, _UPDATE_SCHEMA)
+    if error:
+        return jsonify({"ok": False, "error": error}), 400
+    # forward only the fields the client sent, so a partial body leaves the
+    # rest alone (an explicit null deadline still clears it)
+    fields = {k: data[k] for k in _UPDATE_SCHEMA if k in data}
     try:
-        updated = tm.update_task(tid,
-                                 title=data.get("title"),
-                                 description=data.get("description"),
-                                 priority=data.get("priority"),
-                                 deadline=data.get("deadline"),
-                                 progress=data.get("progress"),
-                                 tags=data.get("tags"))
+        updated = tm.update_task(tid, **fields)
         return jsonify({"ok": True, "task": updated.to_dict()})
     except KeyError:
         return jsonify({"ok": False, "error": "Task not found"}), 404
@@ -754,9 +1308,10 @@ def api_delete_task(tid):
 # API: complete task
 @app.route("/api/complete", methods=["POST"])
 def api_complete():
-    data = request.json or {}
-    tid = data.get("id")
-    if not tid:
+    # valid JSON that isn't an object ([1,2], "x") gets the same 400 as a missing id
+    data = request.get_json(silent=True)
+    tid = data.get("id") if isinstance(data, dict) else None
+    if not tid or not isinstance(tid, str):
         return jsonify({"ok": False, "error": "id required"}), 400
     try:
         tm.complete_task(tid)
@@ -767,10 +1322,12 @@ def api_complete():
 # API: set progress
 @app.route("/api/progress", methods=["POST"])
 def api_progress():
-    data = request.json or {}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
     tid = data.get("id")
     progress = data.get("progress")
-    if tid is None or progress is None:
+    if not isinstance(tid, str) or progress is None:
         return jsonify({"ok": False, "error": "id and progress required"}), 400
     try:
         tm.set_progress(tid, progress)
@@ -781,115 +1338,76 @@ def api_progress():
 # API: mark reminded (so server doesn't re-notify)
 @app.route("/api/mark_reminded", methods=["POST"])
 def api_mark_reminded():
-    data = request.json or {}
-    tid = data.get("id")
-    if not tid:
+    data = request.get_json(silent=True)
+    tid = data.get("id") if isinstance(data, dict) else None
+    if not tid or not isinstance(tid, str):
         return jsonify({"ok": False, "error": "id required"}), 400
-    t = tm.get_task(tid)
-    if not t:
+    try:
+        tm.mark_reminded(tid)
+    except KeyError:
+        # checked inside the locked call, so a concurrent delete is a 404 too
         return jsonify({"ok": False, "error": "not found"}), 404
-    t.reminded = True
     return jsonify({"ok": True})
 
+# API: mark several reminded in one request ({"ids": [...]})
+@app.route("/api/mark_reminded_bulk", methods=["POST"])
+def api_mark_reminded_bulk():
+    data = request.get_json(silent=True)
+    ids = data.get("ids", []) if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(x, str) for x in ids):
+        return jsonify({"ok": False, "error": "ids must be a list of strings"}), 400
+    return jsonify({"ok": True, "count": tm.mark_reminded_many(ids)})
+
 # API: AI schedule
 @app.route("/api/ai_schedule", methods=["GET"])
 def api_ai_schedule():
     try:
-        order = tm.ai_schedule()
+        # optional ?k=N limits the answer to the top N suggestions
         # provide title map too
-        amap = {tid: tm.tasks[tid].title for tid in order}
+        order, amap = tm.ai_schedule_with_titles(k=request.args.get("k", type=int))
         return jsonify({"ok": True, "order": order, "map": amap})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
 # export/import
+# stores at least this big are streamed instead of built (and cached) in one piece
+EXPORT_STREAM_MIN_TASKS = 5000
+
 @app.route("/api/export", methods=["GET"])
 def api_export():
-    return tm.export_json(), 200, {"Content-Type": "application/json"}
+    def build():
+        if len(tm.tasks) >= EXPORT_STREAM_MIN_TASKS:
+            return app.response_class(tm.iter_export_chunks(), mimetype="application/json")
+        # cached bytes go out as-is: no str->UTF-8 pass, and Content-Length is
+        # taken straight from len(data)
+        data = tm.export_json()
+        return app.response_class(data, mimetype="application/json",
+                                  headers={"Content-Length": str(len(data))})
+    return _conditional(build)
 
 @app.route("/api/import", methods=["POST"])
 def api_import():
+    # the JSON parser takes the raw bytes, so no decoded str copy is made
     if 'file' in request.files:
-        txt = request.files['file'].read().decode('utf-8')
+        raw = request.files['file'].read()
     else:
-        txt = request.data.decode('utf-8')
-    try:
-        tm.import_json(txt)
-        return jsonify({"ok": True})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: update task
-@app.route("/api/task/<tid>", methods=["PUT"])
-def api_update_task_route(tid):  # ← changed name
-    data = request.json or {}
-    try:
-        t = tm.update_task(tid, **data)
-        return jsonify({"ok": True, "task": t.to_dict()})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: delete task
-@app.route("/api/task/<tid>", methods=["DELETE"])
-def api_delete_task_route(tid):  # ← unique name
+        # read the raw body exactly once; nothing else on this route parses it
+        raw = request.get_data(cache=False)
     try:
-        tm.delete_task(tid)
+        tm.import_json(raw)
         return jsonify({"ok": True})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 400
 
-# API: mark progress
-@app.route("/api/progress", methods=["POST"])
-def api_set_progress_route():  # ← unique name
-    data = request.json or {}
-    tid = data.get("id")
-    progress = data.get("progress", 0)
-    try:
-        tm.set_progress(tid, progress)
-        return jsonify({"ok": True})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: complete task
-@app.route("/api/complete", methods=["POST"])
-def api_complete_route():  # ← unique name
-    data = request.json or {}
-    tid = data.get("id")
-    try:
-        tm.complete_task(tid)
-        return jsonify({"ok": True})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: export tasks
-@app.route("/api/export", methods=["GET"])
-def api_export_route():  # ← unique name
-    try:
-        txt = tm.export_json()
-        return txt, 200, {"Content-Type": "application/json"}
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: AI schedule
-@app.route("/api/ai_schedule", methods=["GET"])
-def api_ai_schedule_route():  # ← unique name
-    try:
-        order = tm.ai_schedule()
-        id_map = {t.id: t.title for t in tm.list_tasks()}
-        return jsonify({"ok": True, "order": order, "map": id_map})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
-
-# API: mark reminded
-@app.route("/api/mark_reminded", methods=["POST"])
-def api_mark_reminded_route():  # ← unique name
-    data = request.json or {}
-    tid = data.get("id")
-    t = tm.get_task(tid)
-    if not t:
-        return jsonify({"ok": False, "error": "Task not found"}), 404
-    t.reminded = True
-    return jsonify({"ok": True})
-
+# Production: all state lives in this process (tm), so run ONE worker process
+# with several threads, e.g.  gunicorn -w 1 -k gthread --threads 8 do:app
+# Running directly uses waitress when it is installed, else the dev server;
+# both listen on 127.0.0.1:5000 only (there is no login), so exposing the app
+# on other interfaces is an explicit choice of host, not a side effect.
 if __name__ == "__main__":
-    app.run(debug=True)
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="127.0.0.1", port=5000, debug=True)
+    else:
+        serve(app, host="127.0.0.1", port=5000, threads=8)